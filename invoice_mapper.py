@@ -0,0 +1,355 @@
+import pandas as pd
+import numpy as np
+import os
+from typing import Dict, List, Any, Optional, Tuple
+import json
+
+# Configuración declarativa del mapeo fila de Excel -> factura de compra Siigo.
+# Equivale a las constantes de js/src/siigo-api/invoiceMapper.ts, pero editable
+# sin tocar código (puede cargarse desde un archivo JSON con load_mapping_config).
+DEFAULT_MAPPING_CONFIG = {
+    "columns": {
+        "document_type": "Tipo de documento",
+        "supplier_identification": "NIT Emisor",
+        "prefix": "Prefijo",
+        "number": "Folio",
+        "cufe": "CUFE/CUDE",
+        "date": "Fecha Emisión",
+        "total": "Total"
+    },
+    "constants": {
+        "cost_center": 286,       # ID del centro de costos
+        "product_code": "PROD0001",
+        "payment_id": 1225,       # ID del medio de pago
+        "default_prefix": "NA"
+    },
+    "date_format": "%d-%m-%Y",
+    # Tipo de documento -> ID del tipo de comprobante en Siigo (None = no se carga)
+    "document_types": {
+        "Factura electrónica": 5341,
+        "Documento equivalente POS": 5341,
+        "Nota de crédito electrónica": None
+    },
+    # Columna de impuesto -> impuesto en Siigo. La base gravada se deriva de valor / tarifa
+    "taxes": {
+        "IVA": {"id": 2866, "name": "IVA", "percent": 19}
+    },
+    # Impuestos al consumo y otros cargos incluidos en el Total que no son base de los impuestos
+    "levies": ["IC", "INC", "ICL", "ICUI", "IBUA", "INC Bolsas", "IN Carbono",
+               "IN Combustibles", "IC Datos", "INPP", "Timbre"],
+    # Diferencia máxima (en pesos) aceptada por redondeo entre el Total y la suma de los ítems
+    "rounding_tolerance": 1.0
+}
+
+
+def merge_mapping_config(user_config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Completar una configuración parcial con los valores de DEFAULT_MAPPING_CONFIG.
+
+    Las secciones "columns" y "constants" se combinan clave a clave; las demás
+    se reemplazan completas si vienen en la configuración.
+    """
+    config = {}
+    for key, default in DEFAULT_MAPPING_CONFIG.items():
+        value = user_config.get(key, default)
+        if key in ("columns", "constants"):
+            config[key] = {**default, **value}
+        else:
+            config[key] = value
+    return config
+
+
+def load_mapping_config(config_file: str) -> Dict[str, Any]:
+    """
+    Cargar una configuración de mapeo desde un archivo JSON.
+
+    Las secciones no incluidas en el archivo toman el valor de DEFAULT_MAPPING_CONFIG.
+
+    Args:
+        config_file (str): Ruta al archivo JSON de configuración
+    """
+    with open(config_file, 'r', encoding='utf-8') as f:
+        user_config = json.load(f)
+
+    return merge_mapping_config(user_config)
+
+
+class InvoiceMapper:
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        """
+        Inicializar el mapeador de facturas
+
+        Args:
+            config (dict): Configuración de mapeo, completa o parcial (ver DEFAULT_MAPPING_CONFIG)
+        """
+        self.config = merge_mapping_config(config if config is not None else {})
+        self.columns = self.config["columns"]
+        self.constants = self.config["constants"]
+        self.document_types = self.config["document_types"]
+        self.taxes = self.config["taxes"]
+        self.levies = self.config["levies"]
+
+        invalid_taxes = [column for column, tax in self.taxes.items() if not tax.get("percent")]
+        if invalid_taxes:
+            raise ValueError(f"Los impuestos deben tener una tarifa mayor a 0: {invalid_taxes}")
+
+    def validate_columns(self, dataframe: pd.DataFrame) -> List[str]:
+        """
+        Obtener las columnas requeridas por la configuración que no existen en el DataFrame
+        """
+        required = list(self.columns.values()) + list(self.taxes.keys()) + list(self.levies)
+        return [column for column in required if column not in dataframe.columns]
+
+    def _numeric(self, dataframe: pd.DataFrame, column: str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Convertir una columna a números
+
+        Returns:
+            tuple: (valores con vacíos en 0, máscara de celdas con texto no numérico)
+        """
+        original = dataframe[column]
+        values = pd.to_numeric(original, errors='coerce')
+        invalid = (values.isna() & original.notna()).to_numpy()
+        return values.fillna(0).to_numpy(dtype=float), invalid
+
+    def _text(self, dataframe: pd.DataFrame, column: str, default: Optional[str] = None) -> List[Optional[str]]:
+        series = dataframe[column]
+        mask = series.isna()
+        # Una celda vacía convierte las columnas de IDs (NIT, Folio) a float: se
+        # pasan a Int64 para no generar valores como "890916575.0"
+        if pd.api.types.is_float_dtype(series):
+            values = series[~mask]
+            if (values == values.round()).all():
+                series = series.astype("Int64")
+        series = series.astype(object).where(mask, series.astype(str).str.strip())
+        if default is not None:
+            series = series.where(~mask & (series != ""), default)
+        else:
+            series = series.where(~mask, None)
+        return series.tolist()
+
+    def compute_columns(self, dataframe: pd.DataFrame) -> Dict[str, Any]:
+        """
+        Calcular de forma vectorizada todos los valores de las facturas del DataFrame
+
+        El Total se reparte en una base gravada por impuesto (valor / tarifa), los
+        cargos de "levies" y una base exenta con el resto. Las filas que no se
+        pueden cargar quedan marcadas con el motivo en "skip".
+
+        Returns:
+            dict: Listas alineadas por fila con los campos de cada factura
+        """
+        missing = self.validate_columns(dataframe)
+        if missing:
+            raise KeyError(f"Faltan columnas en el Excel: {missing}")
+
+        row_count = len(dataframe)
+        tolerance = self.config["rounding_tolerance"]
+
+        total, invalid_numbers = self._numeric(dataframe, self.columns["total"])
+        invalid_numbers = invalid_numbers | dataframe[self.columns["total"]].isna().to_numpy()
+
+        tax_values = {}
+        taxed_bases = {}
+        remainder = total.copy()
+        for column, tax in self.taxes.items():
+            values, invalid = self._numeric(dataframe, column)
+            invalid_numbers |= invalid
+            tax_values[column] = values.round(2)
+            taxed_bases[column] = (values * 100 / tax["percent"]).round(2)
+            remainder -= tax_values[column] + taxed_bases[column]
+
+        levies = np.zeros(row_count)
+        for column in self.levies:
+            values, invalid = self._numeric(dataframe, column)
+            invalid_numbers |= invalid
+            levies += values
+        levies = levies.round(2)
+        remainder = (remainder - levies).round(2)
+
+        dates = pd.to_datetime(dataframe[self.columns["date"]], format=self.config["date_format"], errors='coerce')
+        dates = dates.dt.strftime("%Y-%m-%d").astype(object).where(dates.notna(), None)
+
+        document_types = self._text(dataframe, self.columns["document_type"])
+        document_ids = [self.document_types.get(document_type) for document_type in document_types]
+
+        # Motivo de omisión por fila; se conserva el primero en orden de prioridad
+        skip = pd.Series([
+            None if document_id is not None
+            else f"'{self.columns['document_type']}' sin comprobante configurado ({document_type})"
+            for document_type, document_id in zip(document_types, document_ids)
+        ], dtype=object)
+        checks = [
+            (dates.isna().to_numpy(), f"'{self.columns['date']}' inválida"),
+            (invalid_numbers, "valores no numéricos en Total o impuestos"),
+            (remainder < -tolerance, "impuestos mayores a la tarifa configurada"),
+        ]
+        for mask, reason in checks:
+            skip[mask & skip.isna().to_numpy()] = reason
+
+        tax_sum = sum(tax_values.values(), np.zeros(row_count))
+        mixed_rate = (remainder > tolerance) & (tax_sum > 0) & skip.isna().to_numpy()
+
+        return {
+            "document_id": document_ids,
+            "supplier_identification": self._text(dataframe, self.columns["supplier_identification"]),
+            "prefix": self._text(dataframe, self.columns["prefix"], self.constants["default_prefix"]),
+            "number": self._text(dataframe, self.columns["number"]),
+            "cufe": self._text(dataframe, self.columns["cufe"]),
+            "date": dates.tolist(),
+            "total": total.round(2).tolist(),
+            "taxes": tax_values,
+            "taxed_bases": taxed_bases,
+            "levies": levies,
+            "remainder": remainder,
+            "mixed_rate": mixed_rate,
+            "skip": skip.tolist()
+        }
+
+    def _build_items(self, computed: Dict[str, Any], row_count: int) -> List[List[Dict[str, Any]]]:
+        items_by_row = [[] for _ in range(row_count)]
+        product_code = self.constants["product_code"]
+        remainder = computed["remainder"]
+        exempt = np.where(remainder > self.config["rounding_tolerance"], remainder, 0.0)
+
+        def add_items(values, description, taxes_for):
+            for index in np.flatnonzero(values > 0):
+                items_by_row[index].append({
+                    "type": "Product",
+                    "code": product_code,
+                    "description": description,
+                    "quantity": 1,
+                    "price": float(values[index]),
+                    "discount": 0,
+                    "taxes": taxes_for(index)
+                })
+
+        for column, values in computed["taxes"].items():
+            tax = self.taxes[column]
+            bases = computed["taxed_bases"][column]
+            add_items(bases, f"Compras gravadas {tax['name']} {tax['percent']}%", lambda index: [{
+                "id": tax["id"],
+                "name": tax["name"],
+                "percent": tax["percent"],
+                "base": float(bases[index]),
+                "value": float(values[index])
+            }])
+
+        add_items(exempt, "Compras exentas", lambda index: [])
+        add_items(computed["levies"], "Impuestos al consumo y otros cargos", lambda index: [])
+
+        # Una diferencia dentro de la tolerancia es redondeo: se ajusta en el primer ítem
+        for index in np.flatnonzero((remainder != 0) & (exempt == 0)):
+            if items_by_row[index]:
+                item = items_by_row[index][0]
+                item["price"] = round(item["price"] + float(remainder[index]), 2)
+                for tax in item["taxes"]:
+                    tax["base"] = item["price"]
+
+        return items_by_row
+
+    def _report_skipped(self, computed: Dict[str, Any]):
+        skipped = {}
+        for index, reason in enumerate(computed["skip"]):
+            if reason is not None:
+                skipped.setdefault(reason, []).append(index + 1)
+
+        for reason, rows in skipped.items():
+            print(f"⚠️ Se omiten {len(rows)} registros: {reason} (filas {rows})")
+
+        mixed_rows = (np.flatnonzero(computed["mixed_rate"]) + 1).tolist()
+        if mixed_rows:
+            print(f"⚠️ {len(mixed_rows)} registros con impuestos a una tarifa distinta de la configurada: "
+                  f"la diferencia se envía como compras exentas (filas {mixed_rows})")
+
+    def build_payloads(self, dataframe: pd.DataFrame) -> List[Dict[str, Any]]:
+        """
+        Construir los payloads JSON de facturas de compra para todo el DataFrame
+
+        Args:
+            dataframe (DataFrame): Datos cargados del Excel (ExcelProcessor.dataframe)
+        """
+        computed = self.compute_columns(dataframe)
+        items_by_row = self._build_items(computed, len(dataframe))
+        self._report_skipped(computed)
+
+        cost_center = self.constants["cost_center"]
+        payment_id = self.constants["payment_id"]
+
+        payloads = []
+        for skip, document_id, supplier, prefix, number, cufe, date, total, items in zip(
+                computed["skip"], computed["document_id"], computed["supplier_identification"],
+                computed["prefix"], computed["number"], computed["cufe"], computed["date"],
+                computed["total"], items_by_row):
+            if skip is not None:
+                continue
+            payloads.append({
+                "document": {
+                    "id": document_id
+                },
+                "date": date,
+                "supplier": {
+                    "identification": supplier
+                },
+                "cost_center": cost_center,
+                "provider_invoice": {
+                    "prefix": prefix,
+                    "number": number
+                },
+                "observations": f"CUFE: {cufe}",
+                "items": items,
+                "payments": [
+                    {
+                        "id": payment_id,
+                        "value": total,
+                        "due_date": date
+                    }
+                ]
+            })
+
+        return payloads
+
+    def export_payloads_to_json(self, payloads: List[Dict[str, Any]], output_file: str):
+        """
+        Guardar los payloads construidos con build_payloads en un archivo JSON
+        """
+        try:
+            with open(output_file, 'w', encoding='utf-8') as f:
+                json.dump(payloads, f, indent=2, ensure_ascii=False)
+
+            print(f"📁 {len(payloads)} facturas exportadas a: {output_file}")
+
+        except Exception as e:
+            print(f"❌ Error exportando facturas: {e}")
+
+
+def main():
+    from excel_processor_script import ExcelProcessor
+
+    excel_file = 'facturas_ejemplo.xlsx'
+    config_file = 'mapeo_facturas.json'  # Opcional: sobrescribe DEFAULT_MAPPING_CONFIG
+    processor = ExcelProcessor(excel_file)
+
+    if not processor.load_excel():
+        return
+
+    config = None
+    if os.path.exists(config_file):
+        print(f"⚙️ Usando configuración de mapeo: {config_file}")
+        config = load_mapping_config(config_file)
+
+    mapper = InvoiceMapper(config)
+    payloads = mapper.build_payloads(processor.dataframe)
+
+    if not payloads:
+        print("❌ No se generaron facturas")
+        return
+
+    print("\n📄 Primera factura:")
+    print(json.dumps(payloads[0], indent=2, ensure_ascii=False))
+
+    base_name = os.path.splitext(excel_file)[0]
+    mapper.export_payloads_to_json(payloads, f"{base_name}_facturas.json")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+import pandas as pd
+import numpy as np
+import os
+from typing import Dict, List, Any, Optional, Tuple, Union
+import json
+
+# Dimensiones de agrupación -> columna del Excel
+DEFAULT_DIMENSIONS = {
+    "supplier": "NIT Emisor",
+    "status": "Estado",
+    "date": "Fecha Emisión",
+    "document_type": "Tipo de documento"
+}
+
+# Signo de las medidas por tipo de documento (los no listados suman con signo +1)
+DEFAULT_DOCUMENT_SIGNS = {
+    "Nota de crédito electrónica": -1
+}
+
+# Columnas numéricas que se pueden totalizar
+DEFAULT_MEASURES = ["IVA", "ICL", "Rete IVA", "Rete Renta", "Rete ICA", "Total"]
+
+
+class InvoiceReport:
+    def __init__(self, dataframe: pd.DataFrame,
+                 dimensions: Optional[Dict[str, str]] = None,
+                 measures: Optional[List[str]] = None,
+                 date_format: str = "%d-%m-%Y",
+                 document_signs: Optional[Dict[str, int]] = None):
+        """
+        Inicializar el reporte sobre las facturas cargadas
+
+        Args:
+            dataframe (DataFrame): Datos cargados del Excel (ExcelProcessor.dataframe)
+            dimensions (dict): Dimensiones de agrupación -> columna del Excel
+            measures (list): Columnas numéricas a totalizar
+            date_format (str): Formato de la columna de fecha de emisión
+            document_signs (dict): Tipo de documento -> signo de sus valores (p. ej. notas crédito -1)
+        """
+        self.dataframe = dataframe
+        self.dimensions = dimensions if dimensions is not None else DEFAULT_DIMENSIONS
+        self.measures = measures if measures is not None else DEFAULT_MEASURES
+        self.date_format = date_format
+        self.document_signs = document_signs if document_signs is not None else DEFAULT_DOCUMENT_SIGNS
+
+        self._signs = None
+        self._values = {}
+        self._indexes = {}
+
+    def get_signs(self) -> np.ndarray:
+        """
+        Obtener (o construir una sola vez) el signo de cada fila según su tipo de documento
+        """
+        if self._signs is None:
+            column = self.dimensions.get("document_type")
+            if column is None or column not in self.dataframe.columns:
+                self._signs = np.ones(len(self.dataframe))
+            else:
+                self._signs = self.dataframe[column].map(self.document_signs).fillna(1).to_numpy(dtype=float)
+
+        return self._signs
+
+    def get_values(self, measure: str) -> np.ndarray:
+        """
+        Obtener (o construir una sola vez) los valores numéricos de una medida, con el
+        signo de su tipo de documento aplicado
+        """
+        if measure not in self._values:
+            if measure not in self.dataframe.columns:
+                raise KeyError(f"Medida no válida: '{measure}' no es una columna del Excel")
+            values = pd.to_numeric(self.dataframe[measure], errors='coerce').fillna(0).to_numpy(dtype=float)
+            self._values[measure] = values * self.get_signs()
+
+        return self._values[measure]
+
+    def _key_values(self, dimension: str) -> pd.Series:
+        # Las claves faltantes (celdas vacías o fechas inválidas) se agrupan como None
+        if dimension == "month":
+            dates = pd.to_datetime(self.dataframe[self.dimensions["date"]], format=self.date_format, errors='coerce')
+            return dates.dt.strftime("%Y-%m").astype(object).where(dates.notna(), None)
+        if dimension not in self.dimensions:
+            raise KeyError(f"Dimensión no válida: '{dimension}'. Opciones: {list(self.dimensions) + ['month']}")
+        column = self.dataframe[self.dimensions[dimension]]
+        if dimension == "date":
+            dates = pd.to_datetime(column, format=self.date_format, errors='coerce')
+            return dates.dt.strftime("%Y-%m-%d").astype(object).where(dates.notna(), None)
+        mask = column.notna()
+        # Una celda vacía convierte columnas de IDs (NIT) a float: se evita el ".0"
+        if pd.api.types.is_float_dtype(column) and (column[mask] == column[mask].round()).all():
+            column = column.astype("Int64")
+        return column.astype(str).astype(object).where(mask, None)
+
+    def get_index(self, by: Union[str, List[str]]) -> Tuple[np.ndarray, pd.DataFrame]:
+        """
+        Obtener (o construir una sola vez) el índice de agrupación de una o varias dimensiones
+
+        Returns:
+            tuple: (código de grupo por fila, DataFrame con las claves de cada grupo)
+        """
+        key = (by,) if isinstance(by, str) else tuple(by)
+
+        if key not in self._indexes:
+            if len(key) == 1:
+                codes, uniques = pd.factorize(self._key_values(key[0]), use_na_sentinel=False)
+                groups = pd.DataFrame({key[0]: pd.Series(np.asarray(uniques, dtype=object), dtype=object)})
+            else:
+                indexes = [self.get_index(dimension) for dimension in key]
+                sizes = [len(groups) for _, groups in indexes]
+                combined = np.ravel_multi_index([codes for codes, _ in indexes], sizes)
+                codes, uniques = pd.factorize(combined)
+                parts = np.unravel_index(uniques, sizes)
+                groups = pd.DataFrame({
+                    dimension: pd.Series(groups_part[dimension].to_numpy()[part], dtype=object)
+                    for dimension, (_, groups_part), part in zip(key, indexes, parts)
+                })
+            self._indexes[key] = (codes, groups)
+
+        return self._indexes[key]
+
+    def sums(self, by: Union[str, List[str]], measures: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Sumar las medidas por grupo
+        """
+        codes, groups = self.get_index(by)
+        measures = measures if measures is not None else self.measures
+
+        result = groups.copy()
+        for measure in measures:
+            result[measure] = np.bincount(codes, weights=self.get_values(measure), minlength=len(groups))
+        return result
+
+    def counts(self, by: Union[str, List[str]]) -> pd.DataFrame:
+        """
+        Contar facturas por grupo
+        """
+        codes, groups = self.get_index(by)
+
+        result = groups.copy()
+        result["count"] = np.bincount(codes, minlength=len(groups))
+        return result
+
+    def summary(self, by: Union[str, List[str]], measures: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Sumas y cantidad de facturas por grupo
+        """
+        result = self.sums(by, measures)
+        result["count"] = self.counts(by)["count"].to_numpy()
+        return result
+
+    def top_n(self, by: Union[str, List[str]], measure: str = "Total", n: int = 10) -> pd.DataFrame:
+        """
+        Obtener los n grupos con mayor valor de la medida
+        """
+        result = self.summary(by, [measure])
+        values = result[measure].to_numpy()
+        n = min(n, len(values))
+        top = np.argpartition(-values, n - 1)[:n] if n > 0 else np.array([], dtype=int)
+        top = top[np.argsort(-values[top], kind='stable')]
+        return result.iloc[top].reset_index(drop=True)
+
+    def monthly_totals(self, by: Union[str, List[str], None] = "supplier",
+                       measures: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Totales mensuales, opcionalmente desagregados por otras dimensiones
+        """
+        if by is None:
+            key = ["month"]
+        else:
+            key = ["month"] + ([by] if isinstance(by, str) else list(by))
+        return self.summary(key, measures).sort_values(key, kind='stable').reset_index(drop=True)
+
+    def export(self, result: pd.DataFrame, output_file: str):
+        """
+        Exportar un resultado a CSV o JSON según la extensión del archivo
+        """
+        extension = os.path.splitext(output_file)[1].lower()
+
+        try:
+            if extension == ".csv":
+                result.to_csv(output_file, index=False, encoding='utf-8')
+            elif extension == ".json":
+                records = result.astype(object).where(result.notna(), None).to_dict(orient='records')
+                with open(output_file, 'w', encoding='utf-8') as f:
+                    json.dump(records, f, indent=2, ensure_ascii=False, default=str)
+            else:
+                print(f"❌ Formato no soportado: '{extension}' (use .csv o .json)")
+                return
+
+            print(f"📁 Reporte exportado a: {output_file}")
+
+        except Exception as e:
+            print(f"❌ Error exportando reporte: {e}")
+
+
+def main():
+    from excel_processor_script import ExcelProcessor
+
+    excel_file = 'facturas_ejemplo.xlsx'
+    processor = ExcelProcessor(excel_file)
+
+    if not processor.load_excel():
+        return
+
+    report = InvoiceReport(processor.dataframe)
+
+    print("\n📊 Totales por estado:")
+    print(report.summary("status").to_string(index=False))
+
+    print("\n🏆 Top 5 proveedores por Total:")
+    print(report.top_n("supplier", "Total", 5).to_string(index=False))
+
+    base_name = os.path.splitext(excel_file)[0]
+    report.export(report.monthly_totals("supplier"), f"{base_name}_mensual.csv")
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,7 @@
 import json
 import os
+import sys
+import csv
 
 def procesar_json(archivo_json):
     """
@@ -46,35 +48,144 @@ def procesar_json(archivo_json):
         print(f"Error al decodificar JSON: {e}")
     except FileNotFoundError:
         print(f"Error: No se pudo encontrar el archivo '{archivo_json}'.")
+    except RecursionError:
+        print(f"Error: El archivo '{archivo_json}' tiene demasiados niveles de anidación para el cargador de JSON.")
     except Exception as e:
         print(f"Error inesperado: {e}")
 
-def procesar_registro(registro, nivel=0):
+def aplanar_registro(registro, separador="."):
     """
-    Procesa un registro individual y extrae todas las claves y valores.
+    Aplana un registro anidado en pares (ruta, valor) usando una pila explícita.
+    
+    Las rutas se forman con las claves y los índices de lista unidos por el
+    separador (por ejemplo "data.IVA" o "items.0.taxes.0.id"). Los diccionarios
+    y listas vacíos se devuelven como valor de su ruta. El recorrido no tiene
+    límite de profundidad; al leer desde archivo el límite lo impone json.load.
+    
+    Args:
+        registro: El registro a aplanar (dict, list, o valor simple)
+        separador (str): Separador entre los niveles de la ruta
+    
+    Yields:
+        tuple: (ruta, valor) para cada valor simple del registro
+    """
+    pila = [("", registro)]
+    
+    while pila:
+        ruta, valor = pila.pop()
+        
+        if isinstance(valor, dict) and valor:
+            hijos = valor.items()
+        elif isinstance(valor, list) and valor:
+            hijos = enumerate(valor)
+        else:
+            yield ruta, valor
+            continue
+        
+        prefijo = f"{ruta}{separador}" if ruta else ""
+        # Se apilan en orden inverso para conservar el orden original al desapilar
+        pila.extend((f"{prefijo}{clave}", hijo) for clave, hijo in reversed(list(hijos)))
+
+def _escribir_texto(salida, filas):
+    salida.write("".join(
+        f"{'' if numero is None else f'[{numero}] '}{ruta}: {valor} (Tipo: {type(valor).__name__})\n"
+        for numero, ruta, valor in filas
+    ))
+
+def _escribir_csv(salida, filas):
+    csv.writer(salida).writerows(
+        (numero, ruta, valor, type(valor).__name__) for numero, ruta, valor in filas
+    )
+
+def _escribir_ndjson(salida, filas):
+    salida.write("".join(
+        json.dumps({"registro": numero, "ruta": ruta, "valor": valor}, ensure_ascii=False, default=str) + "\n"
+        for numero, ruta, valor in filas
+    ))
+
+ESCRITORES = {
+    "txt": _escribir_texto,
+    "csv": _escribir_csv,
+    "ndjson": _escribir_ndjson,
+}
+
+def escribir_filas(salida, filas, formato="txt"):
+    """
+    Escribe filas (registro, ruta, valor) en un archivo abierto con el formato indicado.
+    
+    Args:
+        salida: Archivo de texto abierto para escritura
+        filas (list): Filas (número de registro, ruta, valor)
+        formato (str): "txt", "csv" o "ndjson"
+    """
+    if formato not in ESCRITORES:
+        raise ValueError(f"Formato no soportado: '{formato}' (use txt, csv o ndjson)")
+    ESCRITORES[formato](salida, filas)
+
+def procesar_registro(registro, salida=None):
+    """
+    Procesa un registro individual y escribe todas sus rutas y valores.
     
     Args:
         registro: El registro a procesar (dict, list, o valor simple)
-        nivel (int): Nivel de anidación para la indentación
+        salida: Archivo donde escribir (por defecto la salida estándar)
+    """
+    if salida is None:
+        salida = sys.stdout
+    escribir_filas(salida, [(None, ruta, valor) for ruta, valor in aplanar_registro(registro)])
+
+def aplanar_json(archivo_json, archivo_salida, formato="txt", tamano_lote=10000):
     """
-    indentacion = "  " * nivel
-    
-    if isinstance(registro, dict):
-        for clave, valor in registro.items():
-            if isinstance(valor, (dict, list)):
-                print(f"{indentacion}Clave: '{clave}' -> Tipo: {type(valor).__name__}")
-                procesar_registro(valor, nivel + 1)
-            else:
-                print(f"{indentacion}Clave: '{clave}' -> Valor: {valor} (Tipo: {type(valor).__name__})")
-    
-    elif isinstance(registro, list):
-        print(f"{indentacion}Lista con {len(registro)} elementos:")
-        for i, elemento in enumerate(registro):
-            print(f"{indentacion}  Elemento {i}:")
-            procesar_registro(elemento, nivel + 1)
+    Aplana todos los registros de un archivo JSON y los escribe en un archivo.
     
-    else:
-        print(f"{indentacion}Valor: {registro} (Tipo: {type(valor).__name__})")
+    Args:
+        archivo_json (str): Ruta al archivo JSON
+        archivo_salida (str): Ruta del archivo de salida
+        formato (str): "txt", "csv" o "ndjson"
+        tamano_lote (int): Cantidad de filas acumuladas antes de cada escritura
+    
+    Returns:
+        int: Cantidad de filas escritas
+    """
+    if formato not in ESCRITORES:
+        print(f"Error: Formato no soportado '{formato}' (use txt, csv o ndjson).")
+        return 0
+    
+    try:
+        with open(archivo_json, 'r', encoding='utf-8') as archivo:
+            datos = json.load(archivo)
+        
+        if not isinstance(datos, list):
+            datos = [datos]
+        
+        total_filas = 0
+        with open(archivo_salida, 'w', encoding='utf-8', newline='') as salida:
+            if formato == "csv":
+                csv.writer(salida).writerow(["registro", "ruta", "valor", "tipo"])
+            
+            lote = []
+            for numero, registro in enumerate(datos, 1):
+                lote.extend((numero, ruta, valor) for ruta, valor in aplanar_registro(registro))
+                if len(lote) >= tamano_lote:
+                    escribir_filas(salida, lote, formato)
+                    total_filas += len(lote)
+                    lote = []
+            
+            escribir_filas(salida, lote, formato)
+            total_filas += len(lote)
+        
+        print(f"Se escribieron {total_filas} filas de {len(datos)} registros en '{archivo_salida}'.")
+        return total_filas
+    
+    except json.JSONDecodeError as e:
+        print(f"Error al decodificar JSON: {e}")
+    except FileNotFoundError:
+        print(f"Error: No se pudo encontrar el archivo '{archivo_json}'.")
+    except RecursionError:
+        print(f"Error: El archivo '{archivo_json}' tiene demasiados niveles de anidación para el cargador de JSON.")
+    except Exception as e:
+        print(f"Error inesperado: {e}")
+    return 0
 
 def extraer_claves_especificas(archivo_json, claves_deseadas):
     """
@@ -134,8 +245,9 @@ def main():
     print("\nOpciones de procesamiento:")
     print("1. Procesar todos los registros completos")
     print("2. Extraer claves específicas")
+    print("3. Aplanar todos los registros a un archivo")
     
-    opcion = input("\nSelecciona una opción (1 o 2): ").strip()
+    opcion = input("\nSelecciona una opción (1, 2 o 3): ").strip()
     
     if opcion == "1":
         procesar_json(archivo_json)
@@ -157,6 +269,11 @@ def main():
                 print(f"  {clave}: {valor}")
             print()
     
+    elif opcion == "3":
+        formato = input("Formato de salida (txt, csv o ndjson): ").strip().lower() or "txt"
+        base = os.path.splitext(archivo_json)[0]
+        aplanar_json(archivo_json, f"{base}_plano.{formato}", formato)
+    
     else:
         print("Opción no válida.")
 
@@ -168,4 +285,6 @@ if __name__ == "__main__":
 # 
 # claves = ["nombre", "edad", "email"]
 # resultados = extraer_claves_especificas("mi_archivo.json", claves)
-# print(resultados)
\ No newline at end of file
+# print(resultados)
+#
+# aplanar_json("mi_archivo.json", "mi_archivo_plano.csv", formato="csv")
\ No newline at end of file